@@ -1,10 +1,26 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
+from flask.typing import ResponseReturnValue
 import csv
+from collections.abc import Iterator
+import gzip
 import io
-import re
+import string
+import sys
 import requests
+from requests.adapters import HTTPAdapter
 import time
-import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, TypedDict
+import xxhash
+
+# Optional: google-re2 (same API as `re`) guarantees linear-time matching, but its
+# per-call overhead makes the parser several times slower on our short cells, so it
+# is opt-in via BOGSTRAN_USE_RE2=1. Type checking always sees the stdlib module.
+if TYPE_CHECKING or os.environ.get("BOGSTRAN_USE_RE2") != "1":
+    import re
+else:
+    import re2 as re
   
 
 
@@ -17,28 +33,65 @@ CSV_URL = (
     "1qa13OkWHd2Am1QPsy6UC41OMDwjp6E_bMQ5usTaylFs/export?format=csv&gid=0"
 )
 
+# One keep-alive session for all Google fetches, so repeat checks reuse the TLS connection
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip", "User-Agent": "Mozilla/5.0"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Compiled once at import; these run for every row of every parse.
+_DIGIT_RE = re.compile(r"\d+")
+# file/d/<id>, open?id=<id> and uc?...id=<id> share one scan of the URL
+_DRIVE_RE = re.compile(
+    r"drive\.google\.com/(?:"
+    r"file/d/([a-zA-Z0-9_-]+)"
+    r"|open\?id=([a-zA-Z0-9_-]+)"
+    r"|uc\?[^#\n]*id=([a-zA-Z0-9_-]+))"
+)
+_TYPE_LINE_RE = re.compile(r"(?im)^[^\S\n]*type:(.*)$")
+_TYPE_LINE_STRIP_RE = re.compile(r"(?im)^[^\S\n]*type:.*(?:\n|$)")
+_GID_RE = re.compile(r"[#&?]gid=(\d+)")
+_USERCONTENT_ID_RE = re.compile(r"googleusercontent\.com/.*/([a-zA-Z0-9-_]{20,})\?")
+_SHEET_ID_RE = re.compile(r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)")
+_PUB_SHEET_ID_RE = re.compile(r"docs\.google\.com/spreadsheets/d/e/([a-zA-Z0-9-_]+)")
+
+
+class _SlugTable(dict[int, str]):
+    """str.translate table: keep [a-z0-9], everything else (incl. non-ASCII) becomes '-'."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return "-"
+
+
+_SLUG_TABLE = _SlugTable({c: "-" for c in range(128)})
+_SLUG_TABLE.update({ord(c): c for c in string.ascii_lowercase + string.digits})
+
 
 def slugify(name: str) -> str:
-    name = name.strip().lower()
-    name = re.sub(r"[^a-z0-9]+", "-", name)
-    return name.strip("-") or "mon"
+    name = name.lower().translate(_SLUG_TABLE)
+    # collapse runs of '-' and trim the ends in one split/join
+    return "-".join(filter(None, name.split("-"))) or "mon"
 
 
-def parse_stats(stats_text: str) -> dict:
+def parse_stats(stats_text: str) -> dict[str, int | str]:
     """Turn the stats cell text into a dict like { hp: 60, attack: 75, ... }."""
-    stats = {}
+    stats: dict[str, int | str] = {}
     for line in stats_text.splitlines():
-        line = line.strip().strip(",").strip('"')
-        if not line or ":" not in line:
+        key, sep, val = line.partition(":")
+        if not sep:
             continue
-        key, val = line.split(":", 1)
-        key = key.strip().strip('"').replace("_", " ")
-        m = re.search(r"\d+", val)
-        stats[key] = int(m.group(0)) if m else val.strip()
+        # the ':' separates the ends, so line-level trimming of whitespace, ',' and '"'
+        # only ever touches the left of the key and the right of the value
+        key = sys.intern(key.lstrip().lstrip(",").lstrip('"').strip().strip('"').replace("_", " "))
+        m = _DIGIT_RE.search(val)
+        stats[key] = int(m.group(0)) if m else val.rstrip().rstrip(",").rstrip('"').strip()
     return stats
 
 
-def extract_types(description: str):
+# every mon with the same types shares one interned tuple (only ~18 type names exist)
+_TYPE_SETS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def extract_types(description: str) -> tuple[str, ...]:
     """
     Finds lines starting with 'Type:' and extracts one or more types.
 
@@ -46,25 +99,29 @@ def extract_types(description: str):
       Type: Fighting
       Type: Grass/Ghost
       Type: Fighting, Normal
+
+    Lines are split on plain newlines only (not CR, form feed or Unicode line
+    separators); the parse loop rebuilds each description from splitlines()
+    before calling this.
     """
-    types = []
-    for line in description.splitlines():
-        if line.strip().lower().startswith("type:"):
-            raw = line.split(":", 1)[1].strip()
-            # allow both '/' and ',' separators
-            parts = [t.strip() for t in raw.replace(",", "/").split("/") if t.strip()]
-            types.extend(parts)
-    return types
+    types: list[str] = []
+    for m in _TYPE_LINE_RE.finditer(description):
+        raw = m.group(1).strip()
+        # allow both '/' and ',' separators
+        parts = [t.strip() for t in raw.replace(",", "/").split("/") if t.strip()]
+        types.extend(parts)
+
+    key = tuple(sys.intern(t) for t in types)
+    return _TYPE_SETS.setdefault(key, key)
 
 
 def remove_type_lines(description: str) -> str:
-    """Return description with any 'Type:' lines removed (we show icons instead)."""
-    clean = []
-    for line in description.splitlines():
-        if line.strip().lower().startswith("type:"):
-            continue
-        clean.append(line)
-    return "\n".join(clean).strip()
+    """
+    Return description with any 'Type:' lines removed (we show icons instead).
+
+    Like extract_types, expects text whose lines are separated by plain newlines.
+    """
+    return _TYPE_LINE_STRIP_RE.sub("", description).strip()
 
 def normalize_image_url(url: str) -> str:
     """Convert common Google Drive share links into an <img>-friendly URL."""
@@ -74,21 +131,11 @@ def normalize_image_url(url: str) -> str:
     url = url.strip().strip('"').strip("'")
 
     # file view link: https://drive.google.com/file/d/<id>/view?...
-    m = re.search(r"drive\.google\.com/file/d/([a-zA-Z0-9_-]+)", url)
-    if m:
-        file_id = m.group(1)
-        return f"https://drive.google.com/thumbnail?id={file_id}&sz=w1000"
-
     # open?id=<id>
-    m = re.search(r"drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)", url)
-    if m:
-        file_id = m.group(1)
-        return f"https://drive.google.com/thumbnail?id={file_id}&sz=w1000"
-
     # uc?...id=<id>
-    m = re.search(r"drive\.google\.com/uc\?.*id=([a-zA-Z0-9_-]+)", url)
+    m = _DRIVE_RE.search(url)
     if m:
-        file_id = m.group(1)
+        file_id = next(g for g in m.groups() if g)
         return f"https://drive.google.com/thumbnail?id={file_id}&sz=w1000"
 
     # already-direct image URL
@@ -96,15 +143,40 @@ def normalize_image_url(url: str) -> str:
 
 
 
-def parse_mons_from_csv_text(text: str):
-    """Parse CSV text and convert to a list of mon dicts."""
-    f = io.StringIO(text)
-    reader = list(csv.reader(f))
+_EMPTY_ROW: list[str] = [""] * 7
+
+
+def _csv_reader(data: str | bytes) -> Iterator[list[str]]:
+    """csv.reader over CSV text, or over raw UTF-8 bytes decoded as rows are read."""
+    if isinstance(data, bytes):
+        # Sheets exports are always UTF-8: skip requests' charset sniffing and the
+        # full decoded copy that resp.text would build
+        return csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="replace", newline=""))
+    return csv.reader(io.StringIO(data))
 
-    if not reader:
-        return []
 
-    mons = []
+class Mon(TypedDict):
+    """One dex entry, as parsed from a sheet row and sent to the page as JSON."""
+
+    id: str
+    name: str
+    description: str
+    types: tuple[str, ...]
+    moves_raw: str
+    abilities_raw: str
+    stats_raw: str
+    stats: dict[str, int | str]
+    image_url: str
+    credits: str
+    moves_link: str
+
+
+def parse_mons_from_csv_text(text: str | bytes) -> list[Mon]:
+    """Parse CSV text (or its raw UTF-8 bytes) and convert to a list of mon dicts."""
+    reader = _csv_reader(text)
+    next(reader, None)  # header row
+
+    mons: list[Mon] = []
 
     # Assuming columns:
     # A = general info (name on first line, then description, including 'Type:' line)
@@ -112,21 +184,24 @@ def parse_mons_from_csv_text(text: str):
     # C = abilities
     # D = stats text
     # E = image URL
-    for row in reader[1:]:
-        row = row + [""] * (7 - len(row))  # pad safety
-        colA, colB, colC, colD, colE, colF, colG = row[:7]
+    for row in reader:
+        # pad safety; full-width rows are unpacked as-is without copying
+        if len(row) != 7:
+            row = (row + _EMPTY_ROW)[:7]
+        colA, colB, colC, colD, colE, colF, colG = row
 
         lines = [l for l in colA.splitlines() if l.strip()]
         if not lines:
             continue
 
         name = lines[0].strip()
+        # '\n'-joined, which is what extract_types/remove_type_lines expect
         raw_description = "\n".join(lines[1:]).strip()
 
         types = extract_types(raw_description)
         description = remove_type_lines(raw_description)
 
-        mon = {
+        mon: Mon = {
             "id": slugify(name),
             "name": name,
             "description": description,
@@ -148,93 +223,214 @@ def parse_mons_from_csv_text(text: str):
 
 CHECK_SECONDS = 5 * 60  # how often to check Google Sheet for changes
 
-_last_check = 0.0
 _last_hash = None
-_cached_mons = []
+_last_etag = None
+_last_modified = None
+_cached_mons: list[Mon] = []
+_cached_mons_by_id: dict[str, Mon] = {}
+_refresh_lock = threading.Lock()
+_refresher: threading.Thread | None = None
+
+# moves_link -> learnset CSV url, filled in by the sheet refresh
+_csv_url_by_link: dict[str, str] = {}
+# moves_link -> (earliest next probe time, consecutive failures): negative cache
+_link_probe_backoff: dict[str, tuple[float, int]] = {}
+
+# a failed probe waits one sheet check, then doubles per further failure, up to this
+LINK_RETRY_MAX_SECONDS = 6 * 60 * 60
 
 
-def get_mons_smart():
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict[str, str]:
+    """Validators from a previous response, so the server can answer 304."""
+    headers: dict[str, str] = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _fingerprint(data: bytes) -> str:
+    """Cheap content hash (xxh3, not cryptographic) used only to tell whether the sheet changed."""
+    return xxhash.xxh3_64_hexdigest(data)
+
+
+def _refresh_mons() -> None:
     """
-    Check the sheet occasionally. Only re-parse if the CSV content changed.
+    Fetch the sheet and swap in a freshly parsed mon list if the CSV changed.
     """
-    global _last_check, _last_hash, _cached_mons
+    global _last_hash, _last_etag, _last_modified, _cached_mons, _cached_mons_by_id
 
-    now = time.time()
+    headers = _conditional_headers(_last_etag, _last_modified) if _cached_mons else {}
+    resp = _SESSION.get(CSV_URL, headers=headers, timeout=15)
 
-    # If we've checked recently, return cached data
-    if _cached_mons and (now - _last_check) < CHECK_SECONDS:
-        return _cached_mons
+    # Not modified -> no body was sent, keep cached parsed result
+    if resp.status_code == 304 and _cached_mons:
+        return
 
-    resp = requests.get(CSV_URL, timeout=15)
     resp.raise_for_status()
-    csv_text = resp.text
-
-    # fingerprint the CSV text
-    h = hashlib.sha256(csv_text.encode("utf-8")).hexdigest()
 
-    _last_check = now
+    # fingerprint the raw body (no decode/re-encode round trip)
+    h = _fingerprint(resp.content)
 
     # If unchanged, keep cached parsed result
     if h == _last_hash and _cached_mons:
-        return _cached_mons
-
-    # Changed -> parse and update cache
+        _last_etag = resp.headers.get("ETag")
+        _last_modified = resp.headers.get("Last-Modified")
+        return
+
+    # Changed -> parse, then swap references; readers never see a half-built list.
+    # The hash goes last so anything keyed on it (the rendered page) can't pair
+    # the new hash with the old mons.
+    new_mons = parse_mons_from_csv_text(resp.content)
+    _resolve_learnset_urls(new_mons, probe=False)
+    # reversed so the first mon wins if two rows slugify to the same id
+    _cached_mons_by_id = {m["id"]: m for m in reversed(new_mons)}
+    _cached_mons = new_mons
     _last_hash = h
-    _cached_mons = parse_mons_from_csv_text(csv_text)
+    # only trust the validators once the body they describe is actually cached
+    _last_etag = resp.headers.get("ETag")
+    _last_modified = resp.headers.get("Last-Modified")
+
+
+def _resolve_learnset_urls(mons: list[Mon], probe: bool) -> None:
+    """
+    Resolve each moves link up front so requests don't have to.
+
+    With probe=False only links that need no HTTP call are resolved (safe on the
+    cold-start path). probe=True, used only by the background thread, also follows
+    redirects for the rest. A link whose probe failed backs off: it is retried after
+    CHECK_SECONDS, then twice as long after each further failure, capped at
+    LINK_RETRY_MAX_SECONDS.
+    """
+    now = time.time()
+    for m in mons:
+        link = m["moves_link"]
+        if not link or link in _csv_url_by_link:
+            continue
+
+        csv_url = _sheet_link_to_csv_url(link, follow_redirects=False)
+        if not csv_url and probe:
+            retry_at, failures = _link_probe_backoff.get(link, (0.0, 0))
+            if now < retry_at:
+                continue
+            csv_url = _sheet_link_to_csv_url(link)
+            if not csv_url:
+                delay = min(CHECK_SECONDS * 2 ** failures, LINK_RETRY_MAX_SECONDS)
+                _link_probe_backoff[link] = (now + delay, failures + 1)
+
+        if csv_url:
+            _csv_url_by_link[link] = csv_url
+            _link_probe_backoff.pop(link, None)
+
+
+def _refresh_loop() -> None:
+    """Background poller: user requests only ever read the in-memory cache."""
+    while True:
+        # Probe any links still unresolved on every tick, whether or not the sheet
+        # changed; outside the lock, since each probe can take up to its timeout.
+        # Runs first so links skipped at cold start resolve right away.
+        try:
+            _resolve_learnset_urls(_cached_mons, probe=True)
+        except Exception as e:
+            print("LINK PROBE ERROR:", repr(e))
+
+        time.sleep(CHECK_SECONDS)
+        try:
+            with _refresh_lock:
+                _refresh_mons()
+        except Exception as e:
+            print("SHEET REFRESH ERROR:", repr(e))
+
+
+def get_mons_smart() -> list[Mon]:
+    """
+    Return the cached mons. Only the very first call (cold start) fetches
+    synchronously; after that the background thread keeps the cache fresh.
+    """
+    global _refresher
+
+    if not _cached_mons:
+        with _refresh_lock:
+            if not _cached_mons:
+                _refresh_mons()
+            # started lazily so merely importing the module (reloader parent,
+            # scripts) doesn't poll Google; after the first fetch so its first
+            # probe pass sees the mons
+            if _refresher is None:
+                _refresher = threading.Thread(target=_refresh_loop, daemon=True)
+                _refresher.start()
     return _cached_mons
 
-def _sheet_link_to_csv_url(url: str) -> str | None:
+
+def get_mons_by_id_smart() -> dict[str, Mon]:
+    """Same freshness rules as get_mons_smart, keyed by mon id."""
+    get_mons_smart()
+    return _cached_mons_by_id
+
+
+def _sheet_link_to_csv_url(url: str, follow_redirects: bool = True) -> str | None:
     if not url:
         return None
 
     url = url.strip()
 
+    # Cheap substring checks gate each regex, so most links run at most one pattern.
+
     # Extract gid if present
-    gid_match = re.search(r"[#&?]gid=(\d+)", url)
+    gid_match = _GID_RE.search(url) if "gid=" in url else None
     gid = gid_match.group(1) if gid_match else "0"
 
     # ✅ NEW: googleusercontent export links often contain the real sheet id near the end
     # Example:
     # https://doc-...googleusercontent.com/export/.../*/<SHEET_ID>?format=csv&gid=0
-    m = re.search(r"googleusercontent\.com/.*/([a-zA-Z0-9-_]{20,})\?", url)
-    if m:
-        sheet_id = m.group(1)
-        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+    if "googleusercontent.com" in url:
+        m = _USERCONTENT_ID_RE.search(url)
+        if m:
+            sheet_id = m.group(1)
+            return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+    # Published sheets link: /spreadsheets/d/e/<ID>/pubhtml
+    # (checked first: the standard pattern would also match it, with "e" as the id)
+    if "/spreadsheets/d/e/" in url:
+        m = _PUB_SHEET_ID_RE.search(url)
+        if m:
+            pub_id = m.group(1)
+            return f"https://docs.google.com/spreadsheets/d/e/{pub_id}/pub?output=csv&gid={gid}"
 
     # Standard sheets link: /spreadsheets/d/<ID>
-    m = re.search(r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
-    if m:
-        sheet_id = m.group(1)
-        return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&gid={gid}"
+    elif "/spreadsheets/d/" in url:
+        m = _SHEET_ID_RE.search(url)
+        if m:
+            sheet_id = m.group(1)
+            return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&gid={gid}"
 
-    # Published sheets link: /spreadsheets/d/e/<ID>/pubhtml
-    m = re.search(r"docs\.google\.com/spreadsheets/d/e/([a-zA-Z0-9-_]+)", url)
-    if m:
-        pub_id = m.group(1)
-        return f"https://docs.google.com/spreadsheets/d/e/{pub_id}/pub?output=csv&gid={gid}"
+    if not follow_redirects:
+        return None
 
-    # Fallback: follow redirects (with User-Agent)
+    # Fallback: follow redirects (with User-Agent); only the final URL matters, so
+    # stream and close without downloading the body
     try:
-        r = requests.get(
+        with _SESSION.get(
             url,
             allow_redirects=True,
             timeout=15,
-            headers={"User-Agent": "Mozilla/5.0"},
-        )
-        final = r.url
+            stream=True,
+        ) as r:
+            final = r.url
 
-        gid_match = re.search(r"[#&?]gid=(\d+)", final)
+        gid_match = _GID_RE.search(final)
         gid2 = gid_match.group(1) if gid_match else gid
 
-        m = re.search(r"docs\.google\.com/spreadsheets/d/([a-zA-Z0-9-_]+)", final)
-        if m:
-            sheet_id = m.group(1)
-            return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid2}"
-
-        m = re.search(r"docs\.google\.com/spreadsheets/d/e/([a-zA-Z0-9-_]+)", final)
+        m = _PUB_SHEET_ID_RE.search(final)
         if m:
             pub_id = m.group(1)
             return f"https://docs.google.com/spreadsheets/d/e/{pub_id}/pub?output=csv&gid={gid2}"
+
+        m = _SHEET_ID_RE.search(final)
+        if m:
+            sheet_id = m.group(1)
+            return f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid2}"
     except Exception:
         pass
 
@@ -244,28 +440,35 @@ def _sheet_link_to_csv_url(url: str) -> str | None:
 
 
 # cache learnsets per CSV url
-_learnset_cache: dict[str, dict] = {}
+_learnset_cache: dict[str, dict[str, list[str]]] = {}
 _learnset_cache_ts: dict[str, float] = {}
+_learnset_cache_validators: dict[str, tuple[str | None, str | None]] = {}
+
+# warm path, keyed by mon id: (fetched_at, moves_link it was resolved from, learnset)
+# so a hit skips link normalization entirely
+_learnset_by_mon: dict[str, tuple[float, str, dict[str, list[str]]]] = {}
 
 LEARNSET_CACHE_SECONDS = 8 * 60  # keep in sync with main sheet check
+BROWSER_CACHE_SECONDS = 5 * 60  # how long browsers may reuse / and learnsets without asking
+
 
 
-def _parse_learnset_csv(csv_text: str) -> dict:
+def _parse_learnset_csv(csv_text: str | bytes) -> dict[str, list[str]]:
     """
     Parses a learnset sheet where the FIRST ROW contains category headers
     like: Level Up, TMs, Tutor, Egg (and maybe more columns).
     Returns: { "Level Up": [...], "TMs": [...], ... }
     """
-    f = io.StringIO(csv_text)
-    rows = list(csv.reader(f))
+    reader = _csv_reader(csv_text)
+    first = next(reader, None)
 
-    if not rows:
+    if first is None:
         return {}
 
-    headers = [h.strip() for h in rows[0]]
-    out = {h: [] for h in headers if h}
+    headers = [h.strip() for h in first]
+    out: dict[str, list[str]] = {h: [] for h in headers if h}
 
-    for r in rows[1:]:
+    for r in reader:
         # pad row to headers length
         r = r + [""] * (len(headers) - len(r))
         for i, h in enumerate(headers):
@@ -280,16 +483,32 @@ def _parse_learnset_csv(csv_text: str) -> dict:
     return out
 
 
+def _learnset_response(parsed: dict[str, list[str]]) -> ResponseReturnValue:
+    """JSON learnset with a content ETag, answering 304 when the browser already has it."""
+    resp = jsonify(parsed)
+    # keyed on the body, not the fetch time, so an upstream 304 keeps the browser's copy valid
+    resp.set_etag(_fingerprint(resp.get_data()))
+    resp.cache_control.public = True
+    resp.cache_control.max_age = BROWSER_CACHE_SECONDS
+    return resp.make_conditional(request)
+
+
 @app.route("/api/learnset/<mon_id>")
-def learnset(mon_id):
-    mons = get_mons_smart()
-    mon = next((m for m in mons if m["id"] == mon_id), None)
+def learnset(mon_id: str) -> ResponseReturnValue:
+    mon = get_mons_by_id_smart().get(mon_id)
     if not mon:
         return jsonify({})
 
     # TEMP HARD-CODE for testing:
     link = (mon.get("moves_link") or "").strip()
-    csv_url = _sheet_link_to_csv_url(link)
+
+    now = time.time()
+    hit = _learnset_by_mon.get(mon_id)
+    if hit and hit[1] == link and (now - hit[0]) < LEARNSET_CACHE_SECONDS:
+        return _learnset_response(hit[2])
+
+    # resolved during the sheet refresh; never probe a link over HTTP on the request path
+    csv_url = _csv_url_by_link.get(link) or _sheet_link_to_csv_url(link, follow_redirects=False)
 
     print("MOVES LINK:", link)
     print("CSV URL:", csv_url)
@@ -297,40 +516,88 @@ def learnset(mon_id):
     if not csv_url:
         return jsonify({})
 
-    now = time.time()
-    if csv_url in _learnset_cache and (now - _learnset_cache_ts.get(csv_url, 0)) < LEARNSET_CACHE_SECONDS:
-        return jsonify(_learnset_cache[csv_url])
+    fetched_at = _learnset_cache_ts.get(csv_url, 0)
+    if csv_url in _learnset_cache and (now - fetched_at) < LEARNSET_CACHE_SECONDS:
+        _learnset_by_mon[mon_id] = (fetched_at, link, _learnset_cache[csv_url])
+        return _learnset_response(_learnset_cache[csv_url])
+
+    headers = {}
+    if csv_url in _learnset_cache:
+        headers = _conditional_headers(*_learnset_cache_validators.get(csv_url, (None, None)))
 
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             csv_url,
             timeout=15,
-            headers={"User-Agent": "Mozilla/5.0"},
+            headers=headers,
         )
     except Exception as e:
         print("LEARNSET REQUEST ERROR:", repr(e))
         return jsonify({})
 
+    if resp.status_code == 304 and csv_url in _learnset_cache:
+        _learnset_cache_ts[csv_url] = now
+        _learnset_by_mon[mon_id] = (now, link, _learnset_cache[csv_url])
+        return _learnset_response(_learnset_cache[csv_url])
+
     if resp.status_code != 200:
         print("LEARNSET FETCH FAILED:", resp.status_code)
         print("BODY:", resp.text[:300])
         return jsonify({})
 
-    parsed = _parse_learnset_csv(resp.text)
+    parsed = _parse_learnset_csv(resp.content)
 
     _learnset_cache[csv_url] = parsed
     _learnset_cache_ts[csv_url] = now
-    return jsonify(parsed)
+    _learnset_cache_validators[csv_url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    _learnset_by_mon[mon_id] = (now, link, parsed)
+    return _learnset_response(parsed)
+
+
+
 
 
 
+# (sheet hash it was rendered from, body ETag, html bytes, gzipped html bytes)
+_rendered_page: tuple[str, str, bytes, bytes] = ("", "", b"", b"")
+
+
+def _get_rendered_page() -> tuple[str, bytes, bytes]:
+    """
+    Render dex.html once per sheet version and reuse the bytes until it changes.
+
+    Returns (etag, html, html_gz). The ETag is a fingerprint of the rendered html,
+    so a template change on deploy invalidates browser copies even if the sheet
+    didn't change; the sheet hash only decides when to re-render.
+    """
+    global _rendered_page
 
+    get_mons_smart()
+    # read the hash before the mons: a refresh landing in between only costs a re-render
+    page_hash = _last_hash or ""
+    if _rendered_page[0] != page_hash:
+        html = render_template("dex.html", mons=_cached_mons).encode("utf-8")
+        _rendered_page = (page_hash, _fingerprint(html), html, gzip.compress(html))
+    return _rendered_page[1:]
 
 
 @app.route("/")
-def dex():
+def dex() -> ResponseReturnValue:
     # Single page app: send all mons at once
-    return render_template("dex.html", mons=get_mons_smart())
+    etag, html, html_gz = _get_rendered_page()
+
+    if request.accept_encodings["gzip"]:
+        resp = Response(html_gz, mimetype="text/html")
+        resp.headers["Content-Encoding"] = "gzip"
+        etag = f"{etag}-gz"
+    else:
+        resp = Response(html, mimetype="text/html")
+
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(etag)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = BROWSER_CACHE_SECONDS
+    return resp.make_conditional(request)
 
 
 